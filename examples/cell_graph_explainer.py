@@ -7,7 +7,6 @@ As used in:
 """
 
 import os
-from glob import glob
 from PIL import Image
 import yaml
 import numpy as np
@@ -26,14 +25,28 @@ DEVICE = 'cuda:0' if IS_CUDA else 'cpu'
 NODE_DIM = 514
 
 
+def list_files_by_stem(path, extension):
+    """
+    List the files of a directory with a given extension in a single pass, indexed by stem.
+    """
+    return {
+        entry.name[:-len(extension)]: entry.path
+        for entry in os.scandir(path)
+        if entry.is_file() and entry.name.endswith(extension)
+    }
+
+
 def explain_cell_graphs(cell_graph_path, image_path):
     """
     Generate an explanation for all the cell graphs in cell path dir.
     """
 
     # 1. get cell graph & image paths
-    cg_fnames = glob(os.path.join(cell_graph_path, '*.bin'))
-    image_fnames = glob(os.path.join(image_path, '*.png'))
+    cg_fnames = list_files_by_stem(cell_graph_path, '.bin')
+    image_fnames = list_files_by_stem(image_path, '.png')
+    missing_images = cg_fnames.keys() - image_fnames.keys()
+    assert not missing_images, 'No image found for cell graphs: {}'.format(
+        sorted(missing_images))
 
     # 2. create model
     config_fname = os.path.join(
@@ -41,7 +54,7 @@ def explain_cell_graphs(cell_graph_path, image_path):
         'config',
         'cg_bracs_cggnn_3_classes_gin.yml')
     with open(config_fname, 'r') as file:
-        config = yaml.load(file)
+        config = yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
     model = CellGraphModel(
         gnn_params=config['gnn_params'],
@@ -62,18 +75,15 @@ def explain_cell_graphs(cell_graph_path, image_path):
     )
 
     # 5. process all the images
-    for cg_path in tqdm(cg_fnames):
+    for graph_name in tqdm(sorted(cg_fnames)):
 
         # a. load the graph
-        _, graph_name = os.path.split(cg_path)
-        graph, _ = load_graphs(cg_path)
+        graph, _ = load_graphs(cg_fnames[graph_name])
         graph = graph[0]
         graph = set_graph_on_cuda(graph) if IS_CUDA else graph
 
         # b. load corresponding image
-        image_path = [
-            x for x in image_fnames if graph_name in x.replace(
-                '.png', '.bin')][0]
+        image_path = image_fnames[graph_name]
         _, image_name = os.path.split(image_path)
         image = np.array(Image.open(image_path))
 
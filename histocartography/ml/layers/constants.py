@@ -4,13 +4,15 @@ import dgl
 import numpy as np
 
 
+# activation classes, instantiated by each layer such that modules are never
+# shared across layers or models
 ACTIVATIONS = {
-    'relu': ReLU(),
-    'tanh': Tanh(),
-    'sigmoid': Sigmoid(),
-    'elu': ELU(),
-    'PReLU': PReLU(),
-    'leaky_relu': LeakyReLU()
+    'relu': ReLU,
+    'tanh': Tanh,
+    'sigmoid': Sigmoid,
+    'elu': ELU,
+    'PReLU': PReLU,
+    'leaky_relu': LeakyReLU
 }
 
 
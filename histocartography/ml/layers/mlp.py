@@ -96,7 +96,7 @@ class MLP(nn.Module):
         layer.add_module("dropout", nn.Dropout(self.dropout[layer_id]))
 
         if act:
-            layer.add_module(self.act, self.activation)
+            layer.add_module(self.act, self.activation())
         return layer
 
     def _set_biases(self, bias, num_layers):
@@ -64,7 +64,10 @@ class BaseModel(Module):
             out_fname=os.path.join(checkpoint_path, model_name)
         )
         self.load_state_dict(
-            torch.load(os.path.join(checkpoint_path, model_name))
+            torch.load(
+                os.path.join(checkpoint_path, model_name),
+                map_location='cpu'
+            )
         )
 
     @abstractmethod
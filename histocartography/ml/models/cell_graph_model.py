@@ -63,11 +63,13 @@ class CellGraphModel(BaseModel):
         num_classes = self.num_classes
         candidate = 'bracs_' + model_type + '_' + \
             str(num_classes) + '_classes_' + layer_type + '.pt'
-        if candidate not in list(MODEL_NAME_TO_URL.keys()):
+        if candidate not in MODEL_NAME_TO_URL:
             return ''
 
         # 2nd level-check: Look at all the specific params
-        cand_config = MODEL_NAME_TO_CONFIG[candidate]
+        cand_config = MODEL_NAME_TO_CONFIG.get(candidate)
+        if cand_config is None:
+            return ''
 
         for cand_key, cand_val in cand_config['gnn_params'].items():
             if hasattr(self.cell_graph_gnn, cand_key):
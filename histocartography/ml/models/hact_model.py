@@ -93,12 +93,14 @@ class HACTModel(BaseModel):
 
         candidate = 'bracs_' + model_type + '_' + \
             str(num_classes) + '_classes_' + cg_layer_type + '.pt'
-        if candidate not in list(MODEL_NAME_TO_URL.keys()):
+        if candidate not in MODEL_NAME_TO_URL:
             return ''
 
         # 2nd level-check: Look at all the specific params: CG-GNN, TG-GNN,
         # classification params
-        cand_config = MODEL_NAME_TO_CONFIG[candidate]
+        cand_config = MODEL_NAME_TO_CONFIG.get(candidate)
+        if cand_config is None:
+            return ''
 
         for cand_key, cand_val in cand_config['cg_gnn_params'].items():
             if hasattr(self.superpx_gnn, cand_key):
@@ -168,8 +170,8 @@ class HACTModel(BaseModel):
         """
         Use the assignment matrix to agg the feats
         """
-        num_nodes_per_graph = graph.batch_num_nodes
-        num_nodes_per_graph.insert(0, 0)
+        # copy, such that the batched graph's own list is not modified
+        num_nodes_per_graph = [0] + list(graph.batch_num_nodes)
         intervals = [sum(num_nodes_per_graph[:i + 1])
                      for i in range(len(num_nodes_per_graph))]
 
@@ -1,6 +1,7 @@
 import dgl
 from typing import Dict, Union, Tuple
 import torch
+import torch.nn as nn
 import os
 
 from ..layers.mlp import MLP
@@ -21,6 +22,7 @@ class TissueGraphModel(BaseModel):
             gnn_params: Dict,
             classification_params: Dict,
             node_dim: int,
+            compile_pred_layer: bool = False,
             **kwargs):
         """
         TissueGraphModel model constructor.
@@ -29,6 +31,9 @@ class TissueGraphModel(BaseModel):
             gnn_params (Dict): GNN configuration parameters.
             classification_params (Dict): classification configuration parameters.
             node_dim (int): Tissue node feature dimension.
+            compile_pred_layer (bool): If the classification MLP should be compiled in place with
+                                       nn.Module.compile. Ignored if not available (torch < 2.2).
+                                       Defaults to False.
         """
 
         super().__init__(**kwargs)
@@ -38,6 +43,7 @@ class TissueGraphModel(BaseModel):
         self.gnn_params = gnn_params
         self.classification_params = classification_params
         self.readout_op = gnn_params['readout_op']
+        self.compile_pred_layer = compile_pred_layer
 
         # 2- build tissue graph params
         self._build_tissue_graph_params()
@@ -62,11 +68,13 @@ class TissueGraphModel(BaseModel):
         num_classes = self.num_classes
         candidate = 'bracs_' + model_type + '_' + \
             str(num_classes) + '_classes_' + layer_type + '.pt'
-        if candidate not in list(MODEL_NAME_TO_URL.keys()):
+        if candidate not in MODEL_NAME_TO_URL:
             return ''
 
         # 2nd level-check: Look at all the specific params
-        cand_config = MODEL_NAME_TO_CONFIG[candidate]
+        cand_config = MODEL_NAME_TO_CONFIG.get(candidate)
+        if cand_config is None:
+            return ''
 
         for cand_key, cand_val in cand_config['gnn_params'].items():
             if hasattr(self.superpx_gnn, cand_key):
@@ -110,6 +118,11 @@ class TissueGraphModel(BaseModel):
             out_dim=self.num_classes,
             num_layers=self.classification_params['num_layers'])
 
+        # compile the MLP in place rather than replacing the module, such that
+        # state dict keys, hooks and LRP keep working on pred_layer
+        if self.compile_pred_layer and hasattr(nn.Module, 'compile'):
+            self.pred_layer.compile(dynamic=False)
+
     def forward(
         self,
         graph: Union[dgl.DGLGraph, Tuple[torch.tensor, torch.tensor]]
@@ -16,6 +16,25 @@ from tqdm.auto import tqdm
 from histocartography.utils import dynamic_import_from, signal_last
 
 
+# Pipeline of the current BatchPipelineRunner worker process, built once by
+# BatchPipelineRunner._init_worker
+_WORKER_PIPELINE = None
+
+
+def _iterate_rows(metadata: pd.DataFrame) -> Iterable[Tuple[Any, Dict[str, Any]]]:
+    """Iterates over the rows of a dataframe as (index, row) pairs, with the rows as plain dicts.
+       The dataframe is converted once, instead of building a Series per row as df.iterrows() does.
+       This also keeps the column dtypes, which df.iterrows() upcasts to a common dtype per row.
+
+    Args:
+        metadata (pd.DataFrame): Dataframe to iterate over
+
+    Returns:
+        Iterable[Tuple[Any, Dict[str, Any]]]: Index and row of each line of the dataframe
+    """
+    return zip(metadata.index, metadata.to_dict(orient="records"))
+
+
 class PipelineStep(ABC):
     """Base pipelines step"""
 
@@ -374,21 +393,28 @@ class BatchPipelineRunner:
             **config,
         )
 
-    def _worker_task(self, data: Tuple[Any, pd.core.series.Series]) -> None:
-        """Runs the task of a single worker
-
-        Args:
-            data (Tuple[Any, pd.core.series.Series]): The index and row of the dataframe,
-                                                      as returned from df.iterrows()
+    def _init_worker(self) -> None:
+        """Initializes a worker process by building its pipeline once. The tasks
+           of the worker reuse it instead of rebuilding the pipeline for every row.
         """
+        global _WORKER_PIPELINE
+
         # Disable multiprocessing
         os.environ["OPENBLAS_NUM_THREADS"] = "1"
         os.environ["MKL_NUM_THREADS"] = "1"
         os.environ["OMP_NUM_THREADS"] = "1"
 
+        _WORKER_PIPELINE = self._build_pipeline_runner()
+
+    def _worker_task(self, data: Tuple[Any, Dict[str, Any]]) -> None:
+        """Runs the task of a single worker
+
+        Args:
+            data (Tuple[Any, Dict[str, Any]]): The index and row of the dataframe,
+                                               as returned from _iterate_rows()
+        """
         name, row = data
-        pipeline = self._build_pipeline_runner()
-        pipeline.run(output_name=name, **row)
+        _WORKER_PIPELINE.run(output_name=name, **row)
 
     def link_output(self, link_directory: str) -> None:
         """Creates a symlink between the output directory of the pipeline and the provided path.
@@ -446,7 +472,7 @@ class BatchPipelineRunner:
             batched_out = dict()
             pipeline = self._build_pipeline_runner()
             for name, row in tqdm(
-                metadata.iterrows(), total=len(metadata), file=sys.stdout
+                _iterate_rows(metadata), total=len(metadata), file=sys.stdout
             ):
                 out = pipeline.run(output_name=name, **row)
                 if return_out:
@@ -454,11 +480,11 @@ class BatchPipelineRunner:
             if return_out:
                 return batched_out
         else:
-            worker_pool = multiprocessing.Pool(cores)
+            worker_pool = multiprocessing.Pool(cores, initializer=self._init_worker)
             for _ in tqdm(
                 worker_pool.imap_unordered(
                     self._worker_task,
-                    metadata.iterrows(),
+                    _iterate_rows(metadata),
                 ),
                 total=len(metadata),
                 file=sys.stdout,
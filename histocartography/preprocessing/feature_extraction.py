@@ -12,6 +12,11 @@ import numpy as np
 import torch
 import torchvision
 from histocartography.utils import dynamic_import_from
+from histocartography.utils.torch import (
+    CUDAPrefetcher,
+    ThreadedBatchDataset,
+    get_data_loader_kwargs
+)
 from scipy.stats import skew
 from skimage.feature import greycomatrix, greycoprops
 from skimage.filters.rank import entropy as Entropy
@@ -19,7 +24,7 @@ from skimage.measure import regionprops
 from skimage.morphology import disk
 from sklearn.metrics.pairwise import euclidean_distances
 from torch import nn
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader
 from torchvision import transforms
 from tqdm.auto import tqdm
 
@@ -381,6 +386,16 @@ class PatchFeatureExtractor:
         self.model = self._remove_classifier(model)
         self.model.eval()
 
+        # channels last inputs unlock the tensor core convolution kernels on GPU
+        self.channels_last = False
+        if torch.device(self.device).type == "cuda":
+            try:
+                self.model = self.model.to(memory_format=torch.channels_last)
+                self.channels_last = True
+            except (AttributeError, TypeError):
+                # nn.Module.to supports memory formats from torch 1.5 on
+                pass
+
     @staticmethod
     def _get_num_features(model: nn.Module) -> int:
         """
@@ -475,12 +490,14 @@ class PatchFeatureExtractor:
             torch.Tensor: Embedding of image.
         """
         patch = patch.to(self.device)
+        if self.channels_last:
+            patch = patch.contiguous(memory_format=torch.channels_last)
         with torch.no_grad():
             embeddings = self.model(patch).squeeze()
         return embeddings
 
 
-class InstanceMapPatchDataset(Dataset):
+class InstanceMapPatchDataset(ThreadedBatchDataset):
     """Helper class to use a give image and extracted instance maps as a dataset"""
 
     def __init__(
@@ -493,7 +510,8 @@ class InstanceMapPatchDataset(Dataset):
         fill_value: Optional[int] = 255,
         mean: Optional[List[float]] = None,
         std: Optional[List[float]] = None,
-        transform: Optional[Callable] = None
+        transform: Optional[Callable] = None,
+        num_threads: int = 1
     ) -> None:
         """
         Create a dataset for a given image and extracted instance map with desired patches
@@ -512,7 +530,9 @@ class InstanceMapPatchDataset(Dataset):
             mean (list[float], optional): Channel-wise mean for image normalization.
             std (list[float], optional): Channel-wise std for image normalization.
             transform (Callable): Transform to apply. Defaults to None.
+            num_threads (int): Number of threads to load the patches of a batch with. Defaults to 1.
         """
+        super().__init__(num_threads=num_threads)
         self.image = image
         self.instance_map = instance_map
         self.patch_size = patch_size
@@ -544,6 +564,19 @@ class InstanceMapPatchDataset(Dataset):
         self.patch_instance_index = []
         self.patch_overlap = []
 
+        self.set_transform(transform)
+
+        self._precompute()
+        self._warning()
+
+    def set_transform(self, transform: Optional[Callable] = None) -> None:
+        """
+        Set the transform applied to the patches. The patch information does not depend on
+        the transform, such that the same dataset can be reused for several augmentations.
+
+        Args:
+            transform (Callable): Transform to apply. Defaults to None.
+        """
         basic_transforms = [transforms.ToPILImage()]
         if self.resize_size is not None:
             basic_transforms.append(transforms.Resize(self.resize_size))
@@ -554,9 +587,6 @@ class InstanceMapPatchDataset(Dataset):
             basic_transforms.append(transforms.Normalize(self.mean, self.std))
         self.dataset_transform = transforms.Compose(basic_transforms)
 
-        self._precompute()
-        self._warning()
-
     def _add_patch(self, center_x: int, center_y: int, index: int) -> None:
         """
         Extract and include patch information.
@@ -566,18 +596,14 @@ class InstanceMapPatchDataset(Dataset):
             center_y (int): Centroid y-coordinate of the patch.
             index (int): Instance index to which the patch belongs.
         """
-        mask = np.zeros_like(self.instance_mask)
-        mask[center_y -
-             self.patch_size_2 -
-             self.offset_y: center_y +
-             self.patch_size_2 -
-             self.offset_y, center_x -
-             self.patch_size_2 -
-             self.offset_x: center_x +
-             self.patch_size_2 -
-             self.offset_x] = 1
-
-        overlap = np.sum(mask * self.instance_mask)
+        min_y = center_y - self.patch_size_2 - self.offset_y
+        min_x = center_x - self.patch_size_2 - self.offset_x
+        overlap = np.sum(
+            self.instance_mask[
+                min_y: min_y + 2 * self.patch_size_2,
+                min_x: min_x + 2 * self.patch_size_2
+            ]
+        )
         if overlap > self.threshold:
             loc = [center_x - self.patch_size_2, center_y - self.patch_size_2]
             self.patch_coordinates.append(loc)
@@ -713,6 +739,7 @@ class DeepFeatureExtractor(FeatureExtractor):
         batch_size: int = 32,
         fill_value: int = 255,
         num_workers: int = 0,
+        num_threads: int = 1,
         verbose: bool = False,
         **kwargs,
     ) -> None:
@@ -731,6 +758,7 @@ class DeepFeatureExtractor(FeatureExtractor):
             batch_size (int): Batch size during processing of patches. Defaults to 32.
             fill_value (int): Constant pixel value for image padding. Defaults to 255.
             num_workers (int): Number of workers in data loader. Defaults to 0.
+            num_threads (int): Number of threads to load the patches of a batch with. Defaults to 1.
             verbose (bool): tqdm processing bar. Defaults to False.
         """
         self.architecture = self._preprocess_architecture(architecture)
@@ -765,16 +793,10 @@ class DeepFeatureExtractor(FeatureExtractor):
         self.batch_size = batch_size
         self.architecture_unprocessed = architecture
         self.num_workers = num_workers
+        self.num_threads = num_threads
         if self.num_workers in [0, 1]:
             torch.set_num_threads(1)
 
-    def _collate_patches(self, batch):
-        """Patch collate function"""
-        instance_indices = [item[0] for item in batch]
-        patches = [item[1] for item in batch]
-        patches = torch.stack(patches)
-        return instance_indices, patches
-
     def _extract_features(
         self,
         input_image: np.ndarray,
@@ -791,12 +813,32 @@ class DeepFeatureExtractor(FeatureExtractor):
         Returns:
             torch.Tensor: Extracted features of shape [nr_instances, nr_features]
         """
+        image_dataset = self._build_patch_dataset(
+            input_image, instance_map, transform=transform)
+        return self._embed_patches(image_dataset)
+
+    def _build_patch_dataset(
+        self,
+        input_image: np.ndarray,
+        instance_map: np.ndarray,
+        transform: Optional[Callable] = None
+    ) -> InstanceMapPatchDataset:
+        """
+        Build the patch dataset for a given RGB image and its extracted instance_map.
+
+        Args:
+            input_image (np.ndarray): RGB input image.
+            instance_map (np.ndarray): Extracted instance_map.
+            transform (Callable): Transform to apply. Defaults to None.
+        Returns:
+            InstanceMapPatchDataset: Patch dataset.
+        """
         if self.downsample_factor != 1:
             input_image = self._downsample(input_image, self.downsample_factor)
             instance_map = self._downsample(
                 instance_map, self.downsample_factor)
 
-        image_dataset = InstanceMapPatchDataset(
+        return InstanceMapPatchDataset(
             image=input_image,
             instance_map=instance_map,
             resize_size=self.resize_size,
@@ -805,16 +847,29 @@ class DeepFeatureExtractor(FeatureExtractor):
             fill_value=self.fill_value,
             mean=self.normalizer_mean,
             std=self.normalizer_std,
-            transform=transform
+            transform=transform,
+            num_threads=self.num_threads
         )
+
+    def _embed_patches(
+        self, image_dataset: InstanceMapPatchDataset
+    ) -> torch.Tensor:
+        """
+        Compute the instance features as the average embedding of their patches.
+
+        Args:
+            image_dataset (InstanceMapPatchDataset): Patch dataset.
+        Returns:
+            torch.Tensor: Extracted features of shape [nr_instances, nr_features]
+        """
         image_loader = DataLoader(
             image_dataset,
             shuffle=False,
             batch_size=self.batch_size,
-            num_workers=self.num_workers,
-            collate_fn=self._collate_patches
+            collate_fn=_collate_patches,
+            **get_data_loader_kwargs(self.num_workers, self.device)
         )
-        features = torch.empty(
+        features = torch.zeros(
             size=(
                 len(image_dataset.properties),
                 self.patch_feature_extractor.num_features,
@@ -822,20 +877,25 @@ class DeepFeatureExtractor(FeatureExtractor):
             dtype=torch.float32,
             device=self.device,
         )
-        embeddings = dict()
+        nr_patches = torch.zeros(
+            size=(len(image_dataset.properties),),
+            dtype=torch.float32,
+            device=self.device,
+        )
         for instance_indices, patches in tqdm(
-            image_loader, total=len(image_loader), disable=not self.verbose
+            CUDAPrefetcher(image_loader, self.device),
+            total=len(image_loader),
+            disable=not self.verbose
         ):
             emb = self.patch_feature_extractor(patches)
-            for j, key in enumerate(instance_indices):
-                if key in embeddings:
-                    embeddings[key][0] += emb[j]
-                    embeddings[key][1] += 1
-                else:
-                    embeddings[key] = [emb[j], 1]
+            instance_indices = instance_indices.to(self.device)
+            features.index_add_(
+                0, instance_indices, emb.reshape(len(instance_indices), -1))
+            nr_patches.index_add_(
+                0, instance_indices, torch.ones(len(instance_indices), device=self.device))
 
-        for k, v in embeddings.items():
-            features[k, :] = v[0] / v[1]
+        # average the embeddings of all the patches of an instance
+        features /= nr_patches.clamp(min=1).unsqueeze(1)
 
         return features.cpu().detach()
 
@@ -886,10 +946,12 @@ class AugmentedDeepFeatureExtractor(DeepFeatureExtractor):
             torch.Tensor: Extracted features of shape [nr_instances, nr_augmentations, nr_features].
         """
 
+        # the patches only depend on the instance map, build them once for all augmentations
+        image_dataset = self._build_patch_dataset(input_image, instance_map)
         all_features = list()
         for transform in self.transforms:
-            features = super()._extract_features(
-                input_image, instance_map, transform=transform)
+            image_dataset.set_transform(transform)
+            features = self._embed_patches(image_dataset)
             all_features.append(features)
 
         all_features = torch.stack(all_features)
@@ -897,7 +959,7 @@ class AugmentedDeepFeatureExtractor(DeepFeatureExtractor):
         return all_features
 
 
-class GridPatchDataset(Dataset):
+class GridPatchDataset(ThreadedBatchDataset):
     def __init__(
         self,
         image: np.ndarray,
@@ -907,6 +969,7 @@ class GridPatchDataset(Dataset):
         mean: Optional[List[float]] = None,
         std: Optional[List[float]] = None,
         transform: Optional[Callable] = None,
+        num_threads: int = 1,
     ) -> None:
         """
         Create a dataset for a given image and extracted instance maps with desired patches
@@ -921,8 +984,9 @@ class GridPatchDataset(Dataset):
             mean (list[float], optional): Channel-wise mean for image normalization.
             std (list[float], optional): Channel-wise std for image normalization.
             transform (list[transforms], optional): List of transformations for input image.
+            num_threads (int): Number of threads to load the patches of a batch with. Defaults to 1.
         """
-        super().__init__()
+        super().__init__(num_threads=num_threads)
         basic_transforms = [transforms.ToPILImage()]
         if resize_size is not None:
             basic_transforms.append(transforms.Resize(resize_size))
@@ -941,19 +1005,33 @@ class GridPatchDataset(Dataset):
             (x_bottom_pad, x_top_pad, y_bottom_pad, y_top_pad), 255
         )
         self.image = pad(torch.as_tensor(np.array(image)).permute(
-            [2, 0, 1])).permute([1, 2, 0])
+            [2, 0, 1])).permute([1, 2, 0]).numpy()
         self.patch_size = patch_size
         self.stride = stride
-        self.patches = self._generate_patches()
-
-    def _generate_patches(self):
-        """Extract patches"""
-        patches = self.image.unfold(0, self.patch_size, self.stride).unfold(
-            1, self.patch_size, self.stride
+        self.outshape = (
+            (self.image.shape[0] - self.patch_size) // self.stride + 1,
+            (self.image.shape[1] - self.patch_size) // self.stride + 1,
         )
-        self.outshape = (patches.shape[0], patches.shape[1])
-        patches = patches.reshape([-1, 3, self.patch_size, self.patch_size])
-        return patches
+
+    def _get_patch(self, index: int) -> np.ndarray:
+        """
+        Extract patch from the padded image. Patches are sliced on demand rather than
+        materialized upfront, such that overlapping patches (stride < patch_size) do not
+        duplicate the image in memory.
+
+        Args:
+            index (int): Patch index, in row-major order over the patch grid.
+
+        Returns:
+            np.ndarray: Patch of shape (patch_size, patch_size, 3).
+        """
+        row, col = divmod(index, self.outshape[1])
+        min_y = row * self.stride
+        min_x = col * self.stride
+        return self.image[
+            min_y: min_y + self.patch_size,
+            min_x: min_x + self.patch_size
+        ]
 
     def __getitem__(self, index: int):
         """
@@ -965,12 +1043,11 @@ class GridPatchDataset(Dataset):
         Returns:
             Tuple[int, torch.Tensor]: Patch index, image as tensor.
         """
-        patch = self.dataset_transform(
-            self.patches[index].numpy().transpose([1, 2, 0]))
+        patch = self.dataset_transform(self._get_patch(index))
         return index, patch
 
     def __len__(self) -> int:
-        return len(self.patches)
+        return self.outshape[0] * self.outshape[1]
 
 
 class GridDeepFeatureExtractor(FeatureExtractor):
@@ -985,6 +1062,7 @@ class GridDeepFeatureExtractor(FeatureExtractor):
         batch_size: int = 32,
         fill_value: int = 255,
         num_workers: int = 0,
+        num_threads: int = 1,
         verbose: bool = False,
         **kwargs,
     ) -> None:
@@ -1003,6 +1081,7 @@ class GridDeepFeatureExtractor(FeatureExtractor):
             batch_size (int): Batch size during processing of patches. Defaults to 32.
             fill_value (int): Constant pixel value for image padding. Defaults to 255.
             num_workers (int): Number of workers in data loader. Defaults to 0.
+            num_threads (int): Number of threads to load the patches of a batch with. Defaults to 1.
             verbose (bool): tqdm processing bar. Defaults to False.
         """
         self.architecture = self._preprocess_architecture(architecture)
@@ -1041,16 +1120,10 @@ class GridDeepFeatureExtractor(FeatureExtractor):
         self.fill_value = fill_value
         self.architecture_unprocessed = architecture
         self.num_workers = num_workers
+        self.num_threads = num_threads
         if self.num_workers in [0, 1]:
             torch.set_num_threads(1)
 
-    def _collate_patches(self, batch):
-        """Patch collate function"""
-        indices = [item[0] for item in batch]
-        patches = [item[1] for item in batch]
-        patches = torch.stack(patches)
-        return indices, patches
-
     def _process(  # type: ignore[override]
         self, input_image: np.ndarray
     ) -> torch.Tensor:
@@ -1080,13 +1153,14 @@ class GridDeepFeatureExtractor(FeatureExtractor):
             mean=self.normalizer_mean,
             std=self.normalizer_std,
             transform=transform,
+            num_threads=self.num_threads,
         )
         patch_loader = DataLoader(
             patch_dataset,
             shuffle=False,
             batch_size=self.batch_size,
-            num_workers=self.num_workers,
-            collate_fn=self._collate_patches
+            collate_fn=_collate_patches,
+            **get_data_loader_kwargs(self.num_workers, self.device)
         )
         features = torch.empty(
             size=(
@@ -1096,7 +1170,9 @@ class GridDeepFeatureExtractor(FeatureExtractor):
             device=self.device,
         )
         for i, patches in tqdm(
-            patch_loader, total=len(patch_loader), disable=not self.verbose
+            CUDAPrefetcher(patch_loader, self.device),
+            total=len(patch_loader),
+            disable=not self.verbose
         ):
             embeddings = self.patch_feature_extractor(patches)
             features[i, :] = embeddings
@@ -1154,6 +1230,25 @@ class GridAugmentedDeepFeatureExtractor(GridDeepFeatureExtractor):
         return all_features
 
 
+def _collate_patches(
+    batch: List[Tuple[int, torch.Tensor]]
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Patch collate function. Returns the indices as a single tensor to allow for
+       vectorized indexing, and the stacked patches.
+
+    Args:
+        batch (List[Tuple[int, torch.Tensor]]): List of (index, patch) pairs
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]: Indices of shape [B], patches of shape [B, C, H, W]
+    """
+    indices = torch.as_tensor(
+        np.fromiter((item[0] for item in batch), dtype=np.int64, count=len(batch))
+    )
+    patches = torch.stack([item[1] for item in batch])
+    return indices, patches
+
+
 def _build_augmentations(
     rotations: Optional[List[int]] = None,
     flips: Optional[List[Any]] = None,
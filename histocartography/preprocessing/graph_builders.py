@@ -153,14 +153,11 @@ class BaseGraphBuilder(PipelineStep):
             centroids (np.ndarray): Node centroids
         """
         regions = regionprops(instance_map)
-        centroids = np.empty((len(regions), 2))
-        for i, region in enumerate(regions):
-            center_y, center_x = region.centroid  # (y, x)
-            center_x = int(round(center_x))
-            center_y = int(round(center_y))
-            centroids[i, 0] = center_x
-            centroids[i, 1] = center_y
-        return centroids
+        centroids = np.array(
+            [region.centroid for region in regions],  # (y, x)
+            dtype=float
+        ).reshape(-1, 2)
+        return np.round(centroids[:, ::-1])  # (x, y)
 
     def _set_node_centroids(
             self,
@@ -292,10 +289,11 @@ class RAGGraphBuilder(BaseGraphBuilder):
         assert (
             self.nr_annotation_classes < 256
         ), "Cannot handle that many classes with 8-bits"
-        regions = regionprops(instance_map)
-        labels = torch.empty(len(regions), dtype=torch.uint8)
+        # one node per instance, as enforced when setting the centroids
+        num_nodes = graph.number_of_nodes()
+        labels = torch.empty(num_nodes, dtype=torch.uint8)
 
-        for region_label in np.arange(1, len(regions) + 1):
+        for region_label in np.arange(1, num_nodes + 1):
             histogram = fast_histogram(
                 annotation[instance_map == region_label],
                 nr_values=self.nr_annotation_classes
@@ -317,13 +315,12 @@ class RAGGraphBuilder(BaseGraphBuilder):
             graph: dgl.DGLGraph
     ) -> None:
         """Create the graph topology from the instance connectivty in the instance_map"""
-        regions = regionprops(instance_map)
-        instance_ids = torch.empty(len(regions), dtype=torch.uint8)
+        num_instances = len(centroids)
 
         kernel = np.ones((self.kernel_size, self.kernel_size), np.uint8)
-        adjacency = np.zeros(shape=(len(instance_ids), len(instance_ids)))
+        adjacency = np.zeros(shape=(num_instances, num_instances))
 
-        for instance_id in np.arange(1, len(instance_ids) + 1):
+        for instance_id in np.arange(1, num_instances + 1):
             mask = (instance_map == instance_id).astype(np.uint8)
             dilation = cv2.dilate(mask, kernel, iterations=1)
             boundary = dilation - mask
@@ -333,7 +330,10 @@ class RAGGraphBuilder(BaseGraphBuilder):
             adjacency[instance_id, idx] = 1
 
         edge_list = np.nonzero(adjacency)
-        graph.add_edges(list(edge_list[0]), list(edge_list[1]))
+        graph.add_edges(
+            torch.from_numpy(edge_list[0]),
+            torch.from_numpy(edge_list[1])
+        )
 
         for _ in range(self.hops - 1):
             graph = two_hop_neighborhood(graph)
@@ -362,8 +362,7 @@ class KNNGraphBuilder(BaseGraphBuilder):
             annotation: np.ndarray,
             graph: dgl.DGLGraph) -> None:
         """Set the node labels of the graphs using annotation"""
-        regions = regionprops(instance_map)
-        assert annotation.shape[0] == len(regions), \
+        assert annotation.shape[0] == graph.number_of_nodes(), \
             "Number of annotations do not match number of nodes"
         graph.ndata[LABEL] = torch.FloatTensor(annotation.astype(float))
 
@@ -375,17 +374,22 @@ class KNNGraphBuilder(BaseGraphBuilder):
     ) -> None:
         """Build topology using (thresholded) kNN"""
 
-        # build kNN adjacency
+        # build kNN adjacency, kept sparse and sorted like a dense row-major scan
         adj = kneighbors_graph(
             centroids,
             self.k,
             mode="distance",
             include_self=False,
-            metric="euclidean").toarray()
+            metric="euclidean")
+        adj.sort_indices()
+        adj = adj.tocoo()
 
         # filter edges that are too far (ie larger than thresh)
+        keep = adj.data != 0
         if self.thresh is not None:
-            adj[adj > self.thresh] = 0
+            keep &= adj.data <= self.thresh
 
-        edge_list = np.nonzero(adj)
-        graph.add_edges(list(edge_list[0]), list(edge_list[1]))
+        graph.add_edges(
+            torch.from_numpy(adj.row[keep].astype(np.int64)),
+            torch.from_numpy(adj.col[keep].astype(np.int64))
+        )
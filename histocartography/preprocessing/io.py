@@ -1,3 +1,5 @@
+import hashlib
+import os
 from pathlib import Path
 from typing import Any, Union
 import h5py
@@ -24,11 +26,54 @@ class FileLoader(PipelineStep):
 
 
 class ImageLoader(FileLoader):
+    def __init__(
+        self,
+        cache_path: Union[None, str, Path] = None,
+        **kwargs: Any
+    ) -> None:
+        """Create an image loader
+
+        Args:
+            cache_path (Union[None, str, Path], optional): Directory where decoded images are
+                cached as .npy files. Cached images are memory-mapped on subsequent loads instead
+                of being decoded again. Defaults to None (no caching).
+        """
+        super().__init__(**kwargs)
+        self.cache_path = cache_path
+
     # type: ignore[override]
     def _process(self, path: Union[str, Path]) -> np.ndarray:
         image_path = Path(path)
-        image = load_image(image_path)
-        return image
+        if self.cache_path is None:
+            return load_image(image_path)
+        return self._load_cached(image_path)
+
+    def _load_cached(self, image_path: Path) -> np.ndarray:
+        """Loads an image from the decoded cache, decoding and caching it first if needed.
+           The cached array is mapped copy-on-write, such that in-place modifications by
+           later pipeline steps never reach the cache file.
+
+        Args:
+            image_path (Path): Path of the image
+
+        Returns:
+            np.ndarray: Memory-mapped array representation of the image
+        """
+        # key on the full source path, images with the same name can live in different
+        # directories or differ only by their extension
+        path_hash = hashlib.sha1(
+            str(image_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        cache_file = Path(self.cache_path) / f"{image_path.stem}-{path_hash}.npy"
+        if (
+            not cache_file.exists()
+            or cache_file.stat().st_mtime < image_path.stat().st_mtime
+        ):
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first, concurrent workers may load the same image
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.npy")
+            np.save(tmp_file, load_image(image_path))
+            os.replace(tmp_file, cache_file)
+        return np.load(cache_file, mmap_mode="c")
 
 
 class DGLGraphLoader(FileLoader):
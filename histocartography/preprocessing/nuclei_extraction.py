@@ -20,13 +20,14 @@ from skimage.segmentation import watershed
 from scipy.ndimage import measurements
 from scipy.ndimage.morphology import binary_fill_holes
 
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader
 from torchvision import transforms
 from tqdm import tqdm
 
 from ..pipeline import PipelineStep
 from ..utils.image import extract_patches_from_image
 from ..utils import download_box_link
+from ..utils.torch import CUDAPrefetcher, ThreadedBatchDataset, get_data_loader_kwargs
 
 DATASET_TO_BOX_URL = {
     "pannuke": "https://ibm.box.com/shared/static/hrt04i3dcv1ph1veoz8x6g8a72u0uw58.pt",
@@ -47,6 +48,7 @@ class NucleiExtractor(PipelineStep):
         pretrained_data: str = "pannuke",
         model_path: str = None,
         batch_size: int = None,
+        num_threads: int = 1,
         **kwargs,
     ) -> None:
         """Create a nuclei extractor
@@ -55,6 +57,7 @@ class NucleiExtractor(PipelineStep):
             pretrained_data (str): Load checkpoint pretrained on some data. Options are 'pannuke' or 'monusac'. Default to 'pannuke'.
             model_path (str): Path to a pre-trained model. If none, the checkpoint specified in pretrained_data will be used. Default to None.
             batch_size (int, optional): Batch size. Defaults to None.
+            num_threads (int, optional): Number of threads to load the patches of a batch with. Defaults to 1.
         """
         self.pretrained_data = pretrained_data
         super().__init__(**kwargs)
@@ -67,6 +70,7 @@ class NucleiExtractor(PipelineStep):
             self.batch_size = GPU_DEFAULT_BATCH_SIZE if cuda else CPU_DEFAULT_BATCH_SIZE
         else:
             self.batch_size = batch_size
+        self.num_threads = num_threads
 
         if model_path is None:
             assert pretrained_data in [
@@ -85,7 +89,7 @@ class NucleiExtractor(PipelineStep):
 
     def _load_model_from_path(self, model_path):
         """Load nuclei extraction model from provided model path."""
-        self.model = torch.load(model_path)
+        self.model = torch.load(model_path, map_location=self.device)
 
     def _process(  # type: ignore[override]
         self,
@@ -118,7 +122,8 @@ class NucleiExtractor(PipelineStep):
         if tissue_mask is not None:
             input_image[tissue_mask == 0] = (255, 255, 255)
 
-        image_dataset = ImageToPatchDataset(input_image)
+        image_dataset = ImageToPatchDataset(
+            input_image, num_threads=self.num_threads)
 
         def collate(batch):
             coords = [x[0] for x in batch]
@@ -129,7 +134,8 @@ class NucleiExtractor(PipelineStep):
             image_dataset,
             shuffle=False,
             batch_size=self.batch_size,
-            collate_fn=collate)
+            collate_fn=collate,
+            **get_data_loader_kwargs(0, self.device))
         pred_map = torch.empty(
             size=(image_dataset.max_x_coord, image_dataset.max_y_coord, 3),
             dtype=torch.float32,
@@ -137,7 +143,9 @@ class NucleiExtractor(PipelineStep):
         )
 
         for coords, image_batch in tqdm(
-            image_loader, desc="Patch-level nuclei detection"
+            CUDAPrefetcher(image_loader, self.device),
+            total=len(image_loader),
+            desc="Patch-level nuclei detection"
         ):
             image_batch = image_batch.to(self.device)
             with torch.no_grad():
@@ -183,19 +191,22 @@ class NucleiExtractor(PipelineStep):
             self._link_to_path(Path(link_path) / "nuclei_maps")
 
 
-class ImageToPatchDataset(Dataset):
+class ImageToPatchDataset(ThreadedBatchDataset):
     """Helper class to transform an image as a set of patched wrapped in a pytorch dataset"""
 
     def __init__(
         self,
         image: np.ndarray,
+        num_threads: int = 1,
     ) -> None:
         """Create a dataset for a given image and extracted instance maps with desired patches.
            Patches have shape of (3, 256, 256) as defined by HoverNet model.
 
         Args:
             image (np.ndarray): RGB input image
+            num_threads (int, optional): Number of threads to load the patches of a batch with. Defaults to 1.
         """
+        super().__init__(num_threads=num_threads)
         self.image = image
         self.dataset_transform = transforms.Compose(
             [
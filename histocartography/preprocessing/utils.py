@@ -1,6 +1,8 @@
 """Preprocessing utilities"""
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional
 
 import numpy as np
 from PIL import Image
@@ -22,8 +24,54 @@ def fast_histogram(input_array: np.ndarray, nr_values: int) -> np.ndarray:
     return output_array
 
 
+@lru_cache(maxsize=None)
+def _get_turbojpeg() -> Optional[Any]:
+    """Returns a libjpeg-turbo decoder, or None if PyTurboJPEG is not available"""
+    try:
+        from turbojpeg import TurboJPEG
+        return TurboJPEG()
+    except (ImportError, OSError, RuntimeError):
+        return None
+
+
+def _load_rgb_image_fast(image_path: Path) -> Optional[np.ndarray]:
+    """Decodes an 8-bit RGB image with libjpeg-turbo (JPEG) or libvips (PNG) if these are
+       installed, which is considerably faster than decoding with PIL.
+
+    Args:
+        image_path (Path): Path of the image
+
+    Returns:
+        Optional[np.ndarray]: Array representation of the image, None if no fast decoder applies
+    """
+    suffix = image_path.suffix.lower()
+    if suffix in (".jpg", ".jpeg"):
+        decoder = _get_turbojpeg()
+        if decoder is None:
+            return None
+        from turbojpeg import TJPF_RGB
+        with open(image_path, "rb") as f:
+            return decoder.decode(f.read(), pixel_format=TJPF_RGB)
+    if suffix == ".png":
+        try:
+            import pyvips
+        except (ImportError, OSError):
+            return None
+        image = pyvips.Image.new_from_file(str(image_path), access="sequential")
+        if image.bands != 3 or image.format != "uchar":
+            return None
+        # bytearray keeps the array writable, like the one returned by PIL
+        return np.ndarray(
+            buffer=bytearray(image.write_to_memory()),
+            dtype=np.uint8,
+            shape=(image.height, image.width, image.bands),
+        )
+    return None
+
+
 def load_image(image_path: Path) -> np.ndarray:
-    """Loads an image from a given path and returns it as a numpy array
+    """Loads an image from a given path and returns it as a numpy array.
+       RGB images are decoded with libjpeg-turbo or libvips when available.
 
     Args:
         image_path (Path): Path of the image
@@ -34,7 +82,11 @@ def load_image(image_path: Path) -> np.ndarray:
     assert image_path.exists()
     try:
         with Image.open(image_path) as img:
-            image = np.array(img)
+            image = None
+            if img.mode == "RGB":
+                image = _load_rgb_image_fast(image_path)
+            if image is None:
+                image = np.array(img)
     except OSError as e:
         logging.critical("Could not open %s", image_path)
         raise OSError(e)
@@ -120,11 +120,13 @@ def set_graph_on_cuda(graph):
     cuda_graph = dgl.DGLGraph()
     cuda_graph.add_nodes(graph.number_of_nodes())
     cuda_graph.add_edges(graph.edges()[0], graph.edges()[1])
+    # single (asynchronous) copy per tensor instead of a clone followed by a transfer
     for key_graph, val_graph in graph.ndata.items():
-        tmp = graph.ndata[key_graph].clone()
-        cuda_graph.ndata[key_graph] = tmp.cuda()
+        cuda_graph.ndata[key_graph] = val_graph.to(
+            'cuda', non_blocking=True, copy=True)
     for key_graph, val_graph in graph.edata.items():
-        cuda_graph.edata[key_graph] = graph.edata[key_graph].clone().cuda()
+        cuda_graph.edata[key_graph] = val_graph.to(
+            'cuda', non_blocking=True, copy=True)
     return cuda_graph
 
 
@@ -133,10 +135,9 @@ def set_graph_on_cpu(graph):
     cpu_graph.add_nodes(graph.number_of_nodes())
     cpu_graph.add_edges(graph.edges()[0], graph.edges()[1])
     for key_graph, val_graph in graph.ndata.items():
-        tmp = graph.ndata[key_graph].clone()
-        cpu_graph.ndata[key_graph] = tmp.cpu()
+        cpu_graph.ndata[key_graph] = val_graph.to('cpu', copy=True)
     for key_graph, val_graph in graph.edata.items():
-        cpu_graph.edata[key_graph] = graph.edata[key_graph].clone().cpu()
+        cpu_graph.edata[key_graph] = val_graph.to('cpu', copy=True)
     return cpu_graph
 
 
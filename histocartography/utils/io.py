@@ -1,3 +1,4 @@
+import logging
 import json
 import os
 import torch
@@ -9,6 +10,11 @@ import pickle
 import csv
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def is_box_url(candidate):
     # check if IBM box static link
@@ -57,12 +63,18 @@ def h5_to_numpy(h5_object):
 
 def load_json(fname):
     """
-    Load json file as a dict.
+    Load json file as a dict. Parsed with orjson if installed.
     :param fname: (str) path to json
     """
-    with open(fname, 'r') as in_config:
-        params = json.load(in_config)
-    return params
+    with open(fname, 'rb') as in_config:
+        content = in_config.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # eg NaN/Infinity literals, only accepted by the json module
+            pass
+    return json.loads(content)
 
 
 def write_json(path, data):
@@ -74,15 +86,24 @@ def download_box_link(url, out_fname='box.file'):
     out_dir = os.path.dirname(out_fname)
     check_for_dir(out_dir)
     if os.path.isfile(out_fname):
-        print('File already downloaded.')
+        logging.debug('File %s already downloaded.', out_fname)
         return out_fname
 
     r = requests.get(url, stream=True)
 
-    with open(out_fname, "wb") as large_file:
-        for chunk in r.iter_content(chunk_size=1024):
-            if chunk:
-                large_file.write(chunk)
+    # download to a temporary file first such that concurrent processes never
+    # see (and load) a partially downloaded file
+    tmp_fname = '{}.{}.part'.format(out_fname, os.getpid())
+    try:
+        with open(tmp_fname, "wb") as large_file:
+            for chunk in r.iter_content(chunk_size=1024):
+                if chunk:
+                    large_file.write(chunk)
+        os.replace(tmp_fname, out_fname)
+    finally:
+        # only left behind if the download failed
+        if os.path.exists(tmp_fname):
+            os.remove(tmp_fname)
     return out_fname
 
 
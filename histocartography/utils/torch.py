@@ -1,5 +1,150 @@
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
 import torch
+from torch.utils.data import DataLoader, Dataset
 
 
 def torch_to_numpy(x):
     return x.cpu().detach().numpy()
+
+
+def seed_worker(worker_id: int) -> None:
+    """Seed numpy in a data loader worker from the torch seed of that worker
+
+    Args:
+        worker_id (int): Id of the data loader worker
+    """
+    np.random.seed(torch.initial_seed() % 2 ** 32)
+
+
+def get_data_loader_kwargs(
+    num_workers: int,
+    device: torch.device
+) -> Dict[str, Any]:
+    """Returns the keyword arguments to build a DataLoader with for a given number of workers and device
+
+    Args:
+        num_workers (int): Number of workers in data loader
+        device (torch.device): Device the loaded batches are sent to
+
+    Returns:
+        Dict[str, Any]: DataLoader keyword arguments
+    """
+    kwargs = {
+        'num_workers': num_workers,
+        'pin_memory': device.type == 'cuda',
+    }
+    if num_workers > 0:
+        kwargs['worker_init_fn'] = seed_worker
+        # prefetch_factor is only available from torch 1.7
+        if 'prefetch_factor' in inspect.signature(DataLoader).parameters:
+            kwargs['prefetch_factor'] = 4
+    return kwargs
+
+
+class ThreadedBatchDataset(Dataset):
+    """Base class for map-style datasets that fetch the samples of a batch concurrently
+       with a pool of threads, e.g. to overlap image decoding or PIL transforms that
+       release the GIL. Recent torch versions call __getitems__ with all the indices of
+       a batch, older versions fall back to __getitem__."""
+
+    def __init__(self, num_threads: int = 1) -> None:
+        """
+        Args:
+            num_threads (int, optional): Number of threads to load the samples of a batch with.
+                Defaults to 1, ie. the samples are loaded sequentially without a thread pool.
+        """
+        self.num_threads = num_threads
+
+    def __getitems__(self, indices: List[int]) -> List[Any]:
+        """Loads the samples of a batch
+
+        Args:
+            indices (List[int]): Sample indices
+
+        Returns:
+            List[Any]: Samples, in the order of the indices
+        """
+        if self.num_threads <= 1:
+            return [self.__getitem__(index) for index in indices]
+        return list(self._get_thread_pool().map(self.__getitem__, indices))
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        """Returns the thread pool of the current process, threads do not survive a fork"""
+        if getattr(self, "_thread_pool_pid", None) != os.getpid():
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.num_threads)
+            self._thread_pool_pid = os.getpid()
+        return self._thread_pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_thread_pool", None)
+        state.pop("_thread_pool_pid", None)
+        return state
+
+
+def _to_device(data: Any, device: torch.device) -> Any:
+    """Asynchronously copies all the tensors of a (nested) batch to a device"""
+    if torch.is_tensor(data):
+        return data.to(device, non_blocking=True)
+    if isinstance(data, (list, tuple)):
+        return type(data)(_to_device(x, device) for x in data)
+    return data
+
+
+def _record_stream(data: Any, stream: torch.cuda.Stream) -> None:
+    """Marks all the tensors of a (nested) batch as used by a stream"""
+    if torch.is_tensor(data):
+        data.record_stream(stream)
+    elif isinstance(data, (list, tuple)):
+        for x in data:
+            _record_stream(x, stream)
+
+
+class CUDAPrefetcher:
+    """Helper class to wrap a data loader such that the host to device copy of the next batch
+       runs on a side CUDA stream while the current batch is being processed"""
+
+    def __init__(self, loader: DataLoader, device: torch.device) -> None:
+        """Create a prefetcher for a given loader. Falls back to iterating the loader
+           when the device is not a GPU.
+
+        Args:
+            loader (DataLoader): Data loader to wrap
+            device (torch.device): Device to send the batches to
+        """
+        self.loader = loader
+        self.device = device
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __iter__(self):
+        if self.device.type != 'cuda':
+            yield from self.loader
+            return
+
+        stream = torch.cuda.Stream(device=self.device)
+        current_stream = torch.cuda.current_stream(self.device)
+        iterator = iter(self.loader)
+        next_batch = self._preload(iterator, stream)
+        while next_batch is not None:
+            # only wait for the copy of this batch, not the one issued below
+            current_stream.wait_stream(stream)
+            batch = next_batch
+            _record_stream(batch, current_stream)
+            next_batch = self._preload(iterator, stream)
+            yield batch
+
+    def _preload(self, iterator: Iterator, stream: torch.cuda.Stream) -> Any:
+        """Issues the copy of the next batch on the side stream. Returns None when exhausted"""
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(stream):
+            return _to_device(batch, self.device)
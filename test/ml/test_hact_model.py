@@ -75,6 +75,63 @@ class HACTModelTestCase(unittest.TestCase):
         self.assertEqual(logits.shape[0], 1)
         self.assertEqual(logits.shape[1], 3)
 
+    def test_hact_model_forward_twice_on_batch(self):
+        """Test HACT model forward called twice on the same batch of cell graphs."""
+
+        # 1. Load a cell graph
+        cell_graph, _ = load_graphs(os.path.join(
+            self.cg_graph_path, self.cg_graph_name))
+        cell_graph = cell_graph[0]
+        cell_graph = set_graph_on_cuda(cell_graph) if IS_CUDA else cell_graph
+        cg_node_dim = cell_graph.ndata['feat'].shape[1]
+
+        tissue_graph, _ = load_graphs(os.path.join(
+            self.tg_graph_path, self.tg_graph_name))
+        tissue_graph = tissue_graph[0]
+        tissue_graph = set_graph_on_cuda(
+            tissue_graph) if IS_CUDA else tissue_graph
+        tg_node_dim = tissue_graph.ndata['feat'].shape[1]
+
+        assignment_matrix = torch.randint(
+            2, (tissue_graph.number_of_nodes(), cell_graph.number_of_nodes())).float()
+        assignment_matrix = assignment_matrix.cuda() if IS_CUDA else assignment_matrix
+        assignment_matrix = [assignment_matrix, assignment_matrix]  # ie. batch size is 2.
+
+        # 2. load config
+        config_fname = os.path.join(
+            self.current_path, 'config', 'hact_model.yml')
+        with open(config_fname, 'r') as file:
+            config = yaml.safe_load(file)
+
+        model = HACTModel(
+            cg_gnn_params=config['cg_gnn_params'],
+            tg_gnn_params=config['tg_gnn_params'],
+            classification_params=config['classification_params'],
+            cg_node_dim=cg_node_dim,
+            tg_node_dim=tg_node_dim,
+            num_classes=3
+        ).to(DEVICE)
+        model.eval()
+
+        # 3. forward pass twice with the same batch of cell graphs. The tissue graphs
+        # are batched again, as the forward pass extends their node features.
+        cell_graphs = dgl.batch([cell_graph, cell_graph])
+        batch_num_nodes = list(cell_graphs.batch_num_nodes)
+        with torch.no_grad():
+            logits = model(
+                cell_graphs,
+                dgl.batch([tissue_graph, tissue_graph]),
+                assignment_matrix)
+            logits_again = model(
+                cell_graphs,
+                dgl.batch([tissue_graph, tissue_graph]),
+                assignment_matrix)
+
+        self.assertEqual(list(cell_graphs.batch_num_nodes), batch_num_nodes)
+        self.assertEqual(logits.shape[0], 2)
+        self.assertEqual(logits.shape[1], 3)
+        self.assertTrue(torch.allclose(logits, logits_again, atol=1e-5))
+
     def test_hact_model_bracs_hact_5_classes_pna(self):
         """Test HACT bracs_hact_5_classes_pna model."""
 
@@ -1,5 +1,7 @@
 """Unit test for ml.models.tissue_graph_model"""
 import unittest
+import copy
+import io
 import torch
 import dgl
 import os
@@ -58,6 +60,86 @@ class TGModelTestCase(unittest.TestCase):
         self.assertEqual(logits.shape[0], 1)
         self.assertEqual(logits.shape[1], 3)
 
+    def test_tissue_graph_model_with_compiled_pred_layer(self):
+        """Test tissue graph model with compiled classification MLP."""
+
+        # 1. Load a cell graph
+        graph, _ = load_graphs(os.path.join(self.graph_path, self.graph_name))
+        graph = graph[0]
+        graph = set_graph_on_cuda(graph) if IS_CUDA else graph
+        node_dim = graph.ndata['feat'].shape[1]
+
+        # 2. load config
+        config_fname = os.path.join(
+            self.current_path, 'config', 'tg_model.yml')
+        with open(config_fname, 'r') as file:
+            config = yaml.safe_load(file)
+
+        model = TissueGraphModel(
+            gnn_params=config['gnn_params'],
+            classification_params=config['classification_params'],
+            node_dim=node_dim,
+            num_classes=3,
+            compile_pred_layer=True
+        ).to(DEVICE)
+        model.eval()
+
+        # 3. forward pass
+        with torch.no_grad():
+            logits = model(graph)
+            model.set_lrp(True)
+            ref_logits = model(graph)
+
+        self.assertIsInstance(logits, torch.Tensor)
+        self.assertEqual(logits.shape[0], 1)
+        self.assertEqual(logits.shape[1], 3)
+        self.assertTrue(torch.allclose(logits, ref_logits, atol=1e-5))
+        self.assertTrue(all(
+            key.startswith(('superpx_gnn.', 'pred_layer.'))
+            for key in model.state_dict().keys()))
+
+    def test_tissue_graph_model_copy_with_compiled_pred_layer(self):
+        """Test copying a tissue graph model with compiled classification MLP."""
+
+        # 1. Load a cell graph
+        graph, _ = load_graphs(os.path.join(self.graph_path, self.graph_name))
+        graph = graph[0]
+        graph = set_graph_on_cuda(graph) if IS_CUDA else graph
+        node_dim = graph.ndata['feat'].shape[1]
+
+        # 2. load config
+        config_fname = os.path.join(
+            self.current_path, 'config', 'tg_model.yml')
+        with open(config_fname, 'r') as file:
+            config = yaml.safe_load(file)
+
+        model = TissueGraphModel(
+            gnn_params=config['gnn_params'],
+            classification_params=config['classification_params'],
+            node_dim=node_dim,
+            num_classes=3,
+            compile_pred_layer=True
+        ).to(DEVICE)
+        model.eval()
+
+        # 3. forward pass, then copy and reset the classifier of the copy
+        with torch.no_grad():
+            logits = model(graph)
+            model_copy = copy.deepcopy(model)
+            for param in model_copy.pred_layer.parameters():
+                param.zero_()
+            copy_logits = model_copy(graph)
+
+        self.assertTrue(torch.allclose(logits, model(graph)))
+        self.assertTrue(torch.equal(copy_logits, torch.zeros_like(logits)))
+
+        # 4. the model can be saved as a whole, also when compiled by the caller
+        torch.save(model, io.BytesIO())
+        if hasattr(torch.nn.Module, 'compile'):
+            model.compile()
+            copy.deepcopy(model)
+            torch.save(model, io.BytesIO())
+
     def test_tissue_graph_model_with_batch(self):
         """Test tissue graph model with batch."""
 
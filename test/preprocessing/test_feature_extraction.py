@@ -150,6 +150,35 @@ class FeatureExtractionTestCase(unittest.TestCase):
         # check number features
         self.assertEqual(features.shape[1], 1280)
 
+    def test_deep_nuclei_feature_extractor_batch_size_1(self):
+        """Test deep nuclei feature extractor with pipeline runner and single-patch batches."""
+
+        features = []
+        for config_name in ['deep_nuclei_feature_extractor_noaug.yml',
+                            'deep_nuclei_feature_extractor_batch_size_1.yml']:
+            config_fname = os.path.join(self.current_path,
+                                        'config',
+                                        'feature_extraction',
+                                        config_name)
+            with open(config_fname, 'r') as file:
+                config = yaml.safe_load(file)
+
+            pipeline = PipelineRunner(output_path=self.out_path, **config)
+            output = pipeline.run(
+                output_name=self.image_name.replace('.png', ''),
+                image_path=os.path.join(self.image_path, self.image_name),
+                nuclei_map_path=os.path.join(self.nuclei_map_path, self.nuclei_map_name)
+            )
+            features.append(output['features'])
+
+        self.assertTrue(isinstance(features[1], torch.Tensor))  # check type
+        # check number of nuclei
+        self.assertEqual(features[1].shape[0], 331)
+        # check number features
+        self.assertEqual(features[1].shape[1], 1280)
+        # check same features as with multi-patch batches
+        self.assertTrue(torch.allclose(features[0], features[1], atol=1e-4))
+
     def test_deep_nuclei_feature_extractor_aug(self):
         """Test deep nuclei feature extractor with pipeline runner and with augmentation."""
 
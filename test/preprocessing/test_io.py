@@ -8,6 +8,7 @@ import dgl
 import os
 from PIL import Image
 import shutil
+from glob import glob
 
 from histocartography import PipelineRunner
 from histocartography.preprocessing import ImageLoader, DGLGraphLoader
@@ -98,6 +99,45 @@ class IOTestCase(unittest.TestCase):
         # image HxW = mask HxW
         self.assertEqual(list(image.shape), [1024, 1280, 3])
 
+    def test_image_loader_with_cache(self):
+        """
+        Test Image Loader with decoded image cache.
+        """
+
+        cache_path = os.path.join(self.out_path, 'image_cache')
+        image_loader = ImageLoader(cache_path=cache_path)
+        image = image_loader.process(
+            os.path.join(
+                self.image_path,
+                self.image_name))
+        cached_image = image_loader.process(
+            os.path.join(
+                self.image_path,
+                self.image_name))
+
+        cache_files = glob(os.path.join(
+            cache_path, self.image_name.replace('.jpg', '-*.npy')))
+        self.assertEqual(len(cache_files), 1)
+        self.assertTrue(isinstance(cached_image, np.memmap))
+        self.assertEqual(list(cached_image.shape), [1024, 1280, 3])
+        self.assertTrue(np.array_equal(image, cached_image))
+
+        # images with the same name in different directories are cached separately
+        same_name_paths = []
+        for folder, array in [('a', image), ('b', image[::-1])]:
+            os.makedirs(os.path.join(self.out_path, folder), exist_ok=True)
+            same_name_path = os.path.join(self.out_path, folder, 'image.png')
+            Image.fromarray(np.ascontiguousarray(array)).save(same_name_path)
+            same_name_paths.append(same_name_path)
+        for same_name_path in same_name_paths:
+            image_loader.process(same_name_path)
+        image_a = image_loader.process(same_name_paths[0])
+        image_b = image_loader.process(same_name_paths[1])
+
+        self.assertTrue(isinstance(image_b, np.memmap))
+        self.assertTrue(np.array_equal(image_a, image))
+        self.assertTrue(np.array_equal(image_b, image[::-1]))
+
     def test_graph_loader(self):
         """
         Test DGLGraph Loader.
@@ -4,6 +4,7 @@ import hashlib
 import os
 
 from histocartography.utils import download_box_link
+from histocartography.utils.io import load_json, write_json
 
 
 class IOTestCase(unittest.TestCase):
@@ -14,6 +15,7 @@ class IOTestCase(unittest.TestCase):
         self.box_test_url = 'https://ibm.box.com/shared/static/30uzamx0xr222waqc2dx3uptnvcb5jf0.bmp'
         self.box_md5 = 'd9002fd4dce81f0246626f1df38fdf26'
         self.box_file = 'noise.bmp'
+        self.json_file = 'test.json'
 
     def test_download_box_link(self):
         """
@@ -29,10 +31,20 @@ class IOTestCase(unittest.TestCase):
         # Check that file was correctly downloaded
         self.assertEqual(local_hash, self.box_md5)
 
+    def test_load_json(self):
+        """
+        Test loading a json file.
+        """
+        data = {'image_dimension': [1000, 1000], 'instance_types': [1, 2, 3]}
+        write_json(self.json_file, data)
+        self.assertEqual(load_json(self.json_file), data)
+
     def tearDown(self):
         """Tear down the tests."""
         if os.path.exists(self.box_file):
             os.remove(self.box_file)
+        if os.path.exists(self.json_file):
+            os.remove(self.json_file)
 
 
 if __name__ == "__main__":